@@ -1,88 +1,110 @@
-from django.test import TestCase, Client
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
 from .models import Author, Tag, Post, Comment
-from django.urls import reverse
+from django.urls import reverse, reverse_lazy
 from .forms import CommentForm
 
+URLS = {
+    'index': reverse_lazy('index'),
+    'posts': reverse_lazy('posts-page'),
+}
 
-class StartingPageViewTest(TestCase):
+# Every DB-backed test class here extends TestCase so each test is rolled back
+# instead of flushing the database like TransactionTestCase does. None of the
+# views use transaction.on_commit or raw SQL, so keep it that way.
+#
+# Each class builds its own rows in setUpTestData and nothing else is shared
+# between classes, so the suite is safe to run in parallel:
+#   python manage.py test blog --parallel=auto --keepdb
+
+
+class _PostsFixtureMixin:
     @classmethod
     def setUpTestData(cls):
         # Create an author
-        author = Author.objects.create(first_name="test", last_name="testing", email_address="test@gmail.com")
+        cls.author = Author.objects.create(first_name="test", last_name="testing", email_address="test@gmail.com")
         #  Create tags
-        tag1 = Tag.objects.create(caption="Tag1")
-        tag2 = Tag.objects.create(caption="Tag2")
+        cls.tag1 = Tag.objects.create(caption="Tag1")
+        cls.tag2 = Tag.objects.create(caption="Tag2")
 
         # Create 5 posts
-        for i in range(5):
-            post = Post.objects.create(
+        cls.posts = Post.objects.bulk_create([
+            Post(
                 title = f"Post Title {i}",
                 excerpt = f"Post Excerpt {i}",
                 image = "None",
                 slug = f"post-title-{i}",
                 content = "This is a valid post content",
-                author = author
+                author = cls.author
             )
-            post.tags.add(tag1, tag2)
-    
+            for i in range(5)
+        ])
+        Through = Post.tags.through
+        Through.objects.bulk_create([
+            Through(post_id=post.id, tag_id=tag.id)
+            for post in cls.posts
+            for tag in (cls.tag1, cls.tag2)
+        ], ignore_conflicts=True)
+
+
+class StartingPageViewTest(_PostsFixtureMixin, TestCase):
     def test_view_url_exists_at_desired_location(self):
         response = self.client.get("/")
         self.assertEqual(response.status_code, 200)
     
     def test_view_uses_correct_template(self):
-        response = self.client.get(reverse('index'))
+        response = self.client.get(URLS['index'])
         self.assertTemplateUsed(response, "blog/index.html")
 
     def test_content_data(self):
-        response = self.client.get(reverse('index'))
+        with self.assertNumQueries(1):
+            response = self.client.get(URLS['index'])
         self.assertIn('posts', response.context)
         self.assertEqual(len(response.context['posts']), 3) # Check if only 3 post is displayed
     
     def test_queryset_ordering(self):
-        response = self.client.get(reverse('index'))
-        posts = response.context['posts']
-        self.assertTrue(all(posts[i].date >= posts[i + 1].date for i in range(len(posts) - 1)))
-
+        response = self.client.get(URLS['index'])
+        dates = [post.date for post in response.context['posts']]
+        self.assertEqual(dates, sorted(dates, reverse=True))
 
-class AllPostsViewTest(TestCase):
-    @classmethod
-    def setUpTestData(cls):
-        # Create an author
-        author = Author.objects.create(first_name="test", last_name="testing", email_address="test@gmail.com")
-        
-        # Create tags
-        tag1 = Tag.objects.create(caption="Tag1")
-        tag2 = Tag.objects.create(caption="Tag2")
-        
-        # Create 5 posts
-        for i in range(5):
-            post = Post.objects.create(
-                title=f"Post Title {i}",
-                excerpt=f"Post Excerpt {i}",
-                image="None",  # Assuming you handle the absence of an image in your code
-                slug=f"post-title-{i}",
-                content="This is a valid post content",
-                author=author,
-            )
-            post.tags.add(tag1, tag2)
 
+class AllPostsViewTest(_PostsFixtureMixin, TestCase):
     def test_view_url_exists_at_desired_location(self):
         response = self.client.get('/posts')  
         self.assertEqual(response.status_code, 200)
 
     def test_view_uses_correct_template(self):
-        response = self.client.get(reverse('posts-page')) 
+        response = self.client.get(URLS['posts']) 
         self.assertTemplateUsed(response, 'blog/all-posts.html')
 
     def test_context_data(self):
-        response = self.client.get(reverse('posts-page'))
+        with self.assertNumQueries(1):
+            response = self.client.get(URLS['posts'])
         self.assertIn('posts', response.context)
         self.assertEqual(len(response.context['posts']), 5)  # All posts should be returned
 
     def test_queryset_ordering(self):
-        response = self.client.get(reverse('posts-page'))
-        posts = response.context['posts']
-        self.assertTrue(all(posts[i].date >= posts[i + 1].date for i in range(len(posts) - 1)))
+        response = self.client.get(URLS['posts'])
+        dates = [post.date for post in response.context['posts']]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_query_count_does_not_grow_with_posts(self):
+        with self.assertNumQueries(1):
+            self.client.get(URLS['posts'])
+
+        Post.objects.bulk_create([
+            Post(
+                title=f"Extra Post {i}",
+                excerpt=f"Extra Excerpt {i}",
+                image="None",
+                slug=f"extra-post-{i}",
+                content="This is a valid post content",
+                author=self.author,
+            )
+            for i in range(5)
+        ])
+        with self.assertNumQueries(1):
+            self.client.get(URLS['posts'])
 
 
 class SinglePostViewTest(TestCase):
@@ -104,37 +126,53 @@ class SinglePostViewTest(TestCase):
             image = "None"
         )
         cls.post.tags.add(cls.tag)
+        cls.detail_url = reverse("post-page-detail", args=[cls.post.slug])
 
         # Create comments
-        for i in range(3):
-            Comment.objects.create(
+        cls.initial_comment_count = 3
+        Comment.objects.bulk_create([
+            Comment(
                 user_name=f"User {i}",
                 user_email=f"user{i}@example.com",
                 text=f"Test comment {i}",
                 post=cls.post
             )
+            for i in range(cls.initial_comment_count)
+        ])
 
     def test_get_request(self):
-        response = self.client.get(reverse("post-page-detail", args=[self.post.slug]))
+        with self.assertNumQueries(3):
+            response = self.client.get(self.detail_url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "blog/post-detail.html")
         self.assertEqual(response.context["post"], self.post)
         self.assertEqual(len(response.context["post_tags"]), 1)
         self.assertIsInstance(response.context["comment_form"], CommentForm)
-        self.assertEqual(len(response.context["comments"]), 3)
+        self.assertEqual(len(response.context["comments"]), self.initial_comment_count)
         self.assertFalse(response.context["saved_for_later"])  # Default session is empty
 
+    def test_get_request_query_count_does_not_grow_with_comments(self):
+        self.post.tags.add(Tag.objects.create(caption="Another Tag"))
+        Comment.objects.create(
+            user_name="Another User",
+            user_email="another@example.com",
+            text="Another test comment",
+            post=self.post
+        )
+        with self.assertNumQueries(3):
+            self.client.get(self.detail_url)
+
     def test_get_request_with_saved_post(self):
         session = self.client.session
         session["stored_posts"] = [self.post.id]
         session.save()
 
-        response = self.client.get(reverse("post-page-detail", args=[self.post.slug]))
+        response = self.client.get(self.detail_url)
         self.assertTrue(response.context["saved_for_later"])
 
     def test_post_request_valid_form(self):
         response = self.client.post(
-            reverse("post-page-detail", args=[self.post.slug]),
+            self.detail_url,
             data={
                 "user_name": "New User",
                 "user_email": "newuser@example.com",
@@ -142,12 +180,12 @@ class SinglePostViewTest(TestCase):
             }
         )
         self.assertEqual(response.status_code, 302)  # Redirection
-        self.assertEqual(response["Location"], reverse("post-page-detail", args=[self.post.slug]))
-        self.assertEqual(Comment.objects.filter(post=self.post).count(), 4)  # 1 new comment added
+        self.assertEqual(response["Location"], self.detail_url)
+        self.assertEqual(Comment.objects.filter(post=self.post).count(), self.initial_comment_count + 1)  # 1 new comment added
 
     def test_post_request_invalid_form(self):
         response = self.client.post(
-            reverse("post-page-detail", args=[self.post.slug]),
+            self.detail_url,
             data={
                 "user_name": "",  # Invalid as the name field is required
                 "user_email": "invalid_email",  # Invalid email format
@@ -158,10 +196,21 @@ class SinglePostViewTest(TestCase):
         self.assertTemplateUsed(response, "blog/post-detail.html")
         self.assertIsInstance(response.context["comment_form"], CommentForm)
         self.assertTrue(response.context["comment_form"].errors)  # Form should contain errors
-        self.assertEqual(Comment.objects.filter(post=self.post).count(), 3)  # No new comment added
+        self.assertFalse(Comment.objects.filter(post=self.post, user_email="invalid_email").exists())  # No new comment added
 
 
+# Keep the session in the client's cookie jar instead of the session table
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
 class ReadLaterViewTest(TestCase):
+    read_later_url = reverse_lazy('read-later')
+
+    def store_posts(self, post_ids):
+        session = self.client.session
+        session['stored_posts'] = post_ids
+        session.save()
+        # A signed cookie session gets a new key on every save
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+
     @classmethod
     def setUpTestData(cls):
         # Create an author
@@ -172,40 +221,43 @@ class ReadLaterViewTest(TestCase):
         cls.tag2 = Tag.objects.create(caption="Testing")
         
         # Create posts
-        cls.post1 = Post.objects.create(
-            title="First Post",
-            excerpt="Excerpt for first post",
-            slug="first-post",
-            content="Content for the first post.",
-            author=cls.author,
-            image = "None"
-        )
-        cls.post1.tags.add(cls.tag1, cls.tag2)
-        
-        cls.post2 = Post.objects.create(
-            title="Second Post",
-            excerpt="Excerpt for second post",
-            slug="second-post",
-            content="Content for the second post.",
-            author=cls.author,
-            image = "None"
-        )
-        cls.post2.tags.add(cls.tag1)
-        
-        cls.post3 = Post.objects.create(
-            title="Third Post",
-            excerpt="Excerpt for third post",
-            slug="third-post",
-            content="Content for the third post.",
-            author=cls.author,
-            image = "None"
-        )
-        cls.post3.tags.add(cls.tag2)
+        cls.post1, cls.post2, cls.post3 = Post.objects.bulk_create([
+            Post(
+                title="First Post",
+                excerpt="Excerpt for first post",
+                slug="first-post",
+                content="Content for the first post.",
+                author=cls.author,
+                image = "None"
+            ),
+            Post(
+                title="Second Post",
+                excerpt="Excerpt for second post",
+                slug="second-post",
+                content="Content for the second post.",
+                author=cls.author,
+                image = "None"
+            ),
+            Post(
+                title="Third Post",
+                excerpt="Excerpt for third post",
+                slug="third-post",
+                content="Content for the third post.",
+                author=cls.author,
+                image = "None"
+            ),
+        ])
+        Through = Post.tags.through
+        Through.objects.bulk_create([
+            Through(post_id=post.pk, tag_id=tag.pk)
+            for post, tag in (
+                (cls.post1, cls.tag1),
+                (cls.post1, cls.tag2),
+                (cls.post2, cls.tag1),
+                (cls.post3, cls.tag2),
+            )
+        ])
         
-    def setUp(self):
-        self.client = Client()
-        self.read_later_url = reverse('read-later')  # Replace with your actual URL name
-
     def test_get_read_later_no_posts(self):
         response = self.client.get(self.read_later_url)
         self.assertEqual(response.status_code, 200)
@@ -217,9 +269,7 @@ class ReadLaterViewTest(TestCase):
 
     def test_get_read_later_with_posts(self):
         # Add post1 and post2 to stored_posts in session
-        session = self.client.session
-        session['stored_posts'] = [self.post1.id, self.post2.id]
-        session.save()
+        self.store_posts([self.post1.id, self.post2.id])
         
         response = self.client.get(self.read_later_url)
         self.assertEqual(response.status_code, 200)
@@ -229,6 +279,12 @@ class ReadLaterViewTest(TestCase):
         self.assertTrue(response.context['has_post'])
         self.assertEqual(list(response.context['posts']), [self.post1, self.post2])
 
+    def test_get_read_later_keeps_session_order(self):
+        self.store_posts([self.post3.id, self.post1.id])
+
+        response = self.client.get(self.read_later_url)
+        self.assertEqual(response.context['posts'], [self.post3, self.post1])
+
     def test_post_add_post_to_read_later(self):
         # Initially, stored_posts is empty
         response = self.client.post(self.read_later_url, data={'post_id': self.post3.id})
@@ -242,9 +298,7 @@ class ReadLaterViewTest(TestCase):
 
     def test_post_remove_post_from_read_later(self):
         # Add post1 to stored_posts first
-        session = self.client.session
-        session['stored_posts'] = [self.post1.id]
-        session.save()
+        self.store_posts([self.post1.id])
         
         # Now, send POST request to remove post1
         response = self.client.post(self.read_later_url, data={'post_id': self.post1.id})
@@ -259,25 +313,23 @@ class ReadLaterViewTest(TestCase):
     def test_post_invalid_post_id(self):
         # Send POST request with a non-existent post_id
         invalid_post_id = 9999  # Assuming this ID doesn't exist
-        response = self.client.post(self.read_later_url, data={'post_id': invalid_post_id})
+        with self.assertNumQueries(1):
+            response = self.client.post(self.read_later_url, data={'post_id': invalid_post_id})
         
-        # Depending on your view's implementation, this might raise an error or handle gracefully
-        # Here, we'll assume it redirects as usual
+        # Unknown posts are ignored and the user is sent back home
         self.assertEqual(response.status_code, 302)
         self.assertEqual(response.url, "/")
         
         # Verify that invalid_post_id is not added to stored_posts
         session = self.client.session
-        self.assertIn('stored_posts', session)
-        # self.assertNotIn(invalid_post_id, session['stored_posts'])
+        self.assertNotIn(invalid_post_id, session.get('stored_posts', []))
 
     def test_get_read_later_with_all_posts(self):
         # Add all posts to stored_posts in session
-        session = self.client.session
-        session['stored_posts'] = [self.post1.id, self.post2.id, self.post3.id]
-        session.save()
+        self.store_posts([self.post1.id, self.post2.id, self.post3.id])
         
-        response = self.client.get(self.read_later_url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.read_later_url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "blog/stored-post.html")
         self.assertIn('posts', response.context)
@@ -289,50 +341,57 @@ class ReadLaterViewTest(TestCase):
         )
 
 # Test the Blog App Models
+class BlogModelLogicTests(SimpleTestCase):
+    def test_author_full_name(self):
+        self.assertEqual(Author(first_name="John", last_name="Doe").full_name(), "John Doe")
+
+    def test_post_str(self):
+        self.assertEqual(str(Post(title="Test Post")), "Test Post")
+
+    def test_tag_str(self):
+        self.assertEqual(str(Tag(caption="Django")), "Django")
+
+    def test_comment_str(self):
+        self.assertEqual(Comment(text="This is a test comment.").text, "This is a test comment.")
+
+
 class BlogModelTests(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         # Create tags
-        self.tag1 = Tag.objects.create(caption="Django")
-        self.tag2 = Tag.objects.create(caption="Python")
+        cls.tag1 = Tag.objects.create(caption="Django")
+        cls.tag2 = Tag.objects.create(caption="Python")
 
         # Create an author
-        self.author = Author.objects.create(
+        cls.author = Author.objects.create(
             first_name="John",
             last_name="Doe",
             email_address="john.doe@example.com"
         )
 
         # Create a post
-        self.post = Post.objects.create(
+        cls.post = Post.objects.create(
             title="Test Post",
             excerpt="This is a test excerpt.",
             image="test_image.jpg",
             slug="test-post",
             content="This is the content of the test post.",
-            author=self.author
+            author=cls.author
         )
-        self.post.tags.add(self.tag1, self.tag2)
+        Through = Post.tags.through
+        Through.objects.bulk_create([
+            Through(post_id=cls.post.pk, tag_id=tag.pk)
+            for tag in (cls.tag1, cls.tag2)
+        ])
 
         # Add a comment to the post
-        self.comment = Comment.objects.create(
+        cls.comment = Comment.objects.create(
             user_name="Jane Smith",
             user_email="jane.smith@example.com",
             text="This is a test comment.",
-            post=self.post
+            post=cls.post
         )
 
-    def test_author_full_name(self):
-        self.assertEqual(self.author.full_name(), "John Doe")
-
-    def test_post_str(self):
-        self.assertEqual(str(self.post), "Test Post")
-
-    def test_tag_str(self):
-        self.assertEqual(str(self.tag1), "Django")
-
-    def test_comment_str(self):
-        self.assertEqual(self.comment.text, "This is a test comment.")
-
     def test_post_has_tags(self):
         tags = self.post.tags.all()
         self.assertIn(self.tag1, tags)
@@ -347,46 +406,64 @@ class BlogModelTests(TestCase):
 
 # Testing the comment Form
 class CommentFormTests(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         # Sample valid data for the form
-        self.valid_data = {
+        cls.valid_data = {
             "user_name": "Jane Doe",
             "user_email": "jane.doe@example.com",
             "text": "This is a test comment."
         }
 
         # Sample invalid data
-        self.invalid_data_missing_name = {
+        cls.invalid_data_missing_name = {
             "user_name": "",
             "user_email": "jane.doe@example.com",
             "text": "This is a test comment."
         }
-        self.invalid_data_invalid_email = {
+        cls.invalid_data_invalid_email = {
             "user_name": "Jane Doe",
             "user_email": "invalid-email",
             "text": "This is a test comment."
         }
 
-    def test_form_valid_data(self):
-        form = CommentForm(data=self.valid_data)
-        self.assertTrue(form.is_valid())  # Form should be valid with valid data
-        comment = form.save(commit=False)  # Test that form saves correctly
-        self.assertEqual(comment.user_name, "Jane Doe")
-        self.assertEqual(comment.user_email, "jane.doe@example.com")
-        self.assertEqual(comment.text, "This is a test comment.")
-
-    def test_form_missing_name(self):
-        form = CommentForm(data=self.invalid_data_missing_name)
-        self.assertFalse(form.is_valid())  # Form should be invalid
-        self.assertIn("user_name", form.errors)  # Check if error exists for user_name
-
-    def test_form_invalid_email(self):
-        form = CommentForm(data=self.invalid_data_invalid_email)
-        self.assertFalse(form.is_valid())  # Form should be invalid
-        self.assertIn("user_email", form.errors)  # Check if error exists for user_email
+    def test_form_validation(self):
+        cases = [
+            (self.valid_data, True, None),
+            (self.invalid_data_missing_name, False, "user_name"),
+            (self.invalid_data_invalid_email, False, "user_email"),
+        ]
+        for data, valid, error_field in cases:
+            with self.subTest(data=data):
+                form = CommentForm(data=data)
+                self.assertEqual(form.is_valid(), valid)
+                if error_field:
+                    self.assertIn(error_field, form.errors)  # Check if error exists for the field
+                else:
+                    comment = form.save(commit=False)  # Test that form saves correctly
+                    self.assertEqual(comment.user_name, data["user_name"])
+                    self.assertEqual(comment.user_email, data["user_email"])
+                    self.assertEqual(comment.text, data["text"])
 
     def test_form_labels(self):
         form = CommentForm()
         self.assertEqual(form.fields["user_name"].label, "Your Name")
         self.assertEqual(form.fields["user_email"].label, "Your Email")
         self.assertEqual(form.fields["text"].label, "Your Comment")
+
+
+# Guard against falling back to the much slower TransactionTestCase
+class TestCaseTypeTests(SimpleTestCase):
+    def test_all_cases_are_fast_testcase(self):
+        # TestCase itself subclasses TransactionTestCase, so only flag classes
+        # that get database access without the per-test rollback.
+        db_cases = [
+            obj for obj in globals().values()
+            if isinstance(obj, type)
+            and issubclass(obj, TransactionTestCase)
+            and obj.__module__ == __name__
+        ]
+        self.assertIn(ReadLaterViewTest, db_cases)
+        for cls in db_cases:
+            with self.subTest(cls=cls.__name__):
+                self.assertTrue(issubclass(cls, TestCase))
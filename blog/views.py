@@ -39,6 +39,7 @@ from .forms import CommentForm
 class StartingPageView(ListView):
     template_name = "blog/index.html"
     model = Post
+    queryset = Post.objects.only("title", "excerpt", "image", "date", "slug")
     ordering = ["-date"]
     context_object_name = "posts"
 
@@ -50,6 +51,7 @@ class StartingPageView(ListView):
 class AllPostsView(ListView):
     template_name = "blog/all-posts.html"
     model = Post
+    queryset = Post.objects.only("title", "excerpt", "image", "date", "slug")
     ordering = ["-date"]
     context_object_name = "posts"
 
@@ -65,7 +67,7 @@ class SinglePostView(View):
         return is_saved_for_later
 
     def get(self, request, slug):
-        post = Post.objects.get(slug=slug)
+        post = Post.objects.select_related("author").get(slug=slug)
         context = {
           "post": post,
           "post_tags": post.tags.all(),
@@ -77,7 +79,7 @@ class SinglePostView(View):
 
     def post(self, request, slug):
         comment_form = CommentForm(request.POST)
-        post = Post.objects.get(slug=slug)
+        post = Post.objects.select_related("author").get(slug=slug)
 
         if comment_form.is_valid():
           comment = comment_form.save(commit=False)
@@ -104,8 +106,8 @@ class ReadLaterView(View):
             context["posts"] = []
             context["has_post"] = False
         else:
-            posts = Post.objects.filter(id__in=stored_posts)
-            context["posts"] = posts
+            posts = Post.objects.in_bulk(stored_posts)
+            context["posts"] = [posts[post_id] for post_id in stored_posts if post_id in posts]
             context["has_post"] = True
         print(context)
 
@@ -119,10 +121,12 @@ class ReadLaterView(View):
 
         post_id = int(request.POST["post_id"])
 
-        if post_id not in stored_posts:
+        if post_id in stored_posts:
+          stored_posts.remove(post_id)
+        elif Post.objects.filter(pk=post_id).exists():
           stored_posts.append(post_id)
         else:
-          stored_posts.remove(post_id)
+          return HttpResponseRedirect("/")
 
         request.session["stored_posts"] = stored_posts
         
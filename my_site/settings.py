@@ -75,6 +75,8 @@ WSGI_APPLICATION = "my_site.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# The test runner swaps this SQLite file for an in-memory database, so tests
+# never fsync and need no extra PRAGMAs here.
 
 DATABASES = {
     "default": {